@@ -72,7 +72,7 @@ __all__ = [
     'cos', 'tan', 'tanh',
     'erf', 'erfc', 'erfinv',
     'add', 'sub', 'mul', 'div', 'mod', 'pow', 'sqrt', 'truediv', 'floordiv',
-    'add_n',
+    'addcmul', 'add_n',
 
     # reduce operators
     'reduce_sum', 'reduce_sum_axis', 'reduce_mean', 'reduce_mean_axis',
@@ -368,6 +368,13 @@ def from_numpy(data,
     """
     if device is None:
         device = current_device()
+    if device.startswith('cuda'):
+        # Cast on the host, then stage the data in page-locked memory, such
+        # that the copy to the GPU does not block the calling thread.  The
+        # copy is still issued on the current CUDA stream, thus it does not
+        # overlap with the kernels queued on that stream.
+        ret = as_tensor(data, dtype=dtype, device='cpu').pin_memory()
+        return ret.to(device=device, non_blocking=True)
     return as_tensor(data, dtype=dtype, device=device, force_copy=True)
 
 
@@ -1329,6 +1336,15 @@ def floordiv(x: Tensor, y: Tensor) -> Tensor:
     return ret
 
 
+# ---- trivariate element-wise math operations ----
+@jit
+def addcmul(input: Tensor, x: Tensor, y: Tensor,
+            out: Optional[Tensor] = None) -> Tensor:
+    if out is None:
+        return torch.addcmul(input, x, y)
+    return torch.addcmul(input, x, y, out=out)
+
+
 # ---- sequential math operations ----
 @jit
 def add_n(tensors: List[Tensor]) -> Tensor:
@@ -71,8 +71,16 @@ def uniform(shape: List[int], low: float, high: float,
     if low >= high:
         raise ValueError('`low` < `high` does not hold: low == {}, high == {}'.
                          format(low, high))
-    scale = high - low
-    return rand(shape, dtype, device=device) * scale + low
+    if dtype == 'float32':
+        real_dtype = torch.float32
+    else:
+        real_dtype = {'float16': torch.float16, 'float64': torch.float64}[dtype]
+
+    if device is None:
+        device = current_device()
+    # `uniform_` draws and scales the samples within one kernel, thus
+    # no intermediate tensor will be allocated.
+    return torch.empty(shape, dtype=real_dtype, device=device).uniform_(low, high)
 
 
 @jit
@@ -163,7 +171,8 @@ def normal(mean: Tensor,
     param_shape = get_broadcast_shape(shape(mean), shape(std))
     if n_samples is not None:
         param_shape = [n_samples] + param_shape
-    r = std * torch.randn(param_shape, dtype=mean.dtype, device=mean.device) + mean
+    r = torch.addcmul(
+        mean, std, torch.randn(param_shape, dtype=mean.dtype, device=mean.device))
     if not reparameterized:
         r = r.detach()
     return r
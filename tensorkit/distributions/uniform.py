@@ -1,13 +1,27 @@
+import math
 from typing import *
 
+import numpy as np
+
 from .. import tensor as T
 from ..stochastic import StochasticTensor
 from ..typing_ import *
 from .base import Distribution
-from .utils import log_pdf_mask, copy_distribution, check_tensor_arg_types
+from .utils import (log_pdf_mask, in_range_mask, copy_distribution,
+                    check_tensor_arg_types, get_tail_size)
 
 __all__ = ['Uniform']
 
+_NEG_AXES_CACHE: Dict[int, List[int]] = {}
+
+
+def _neg_axes(n: int) -> List[int]:
+    # the returned list is shared among calls, and must not be modified
+    ret = _NEG_AXES_CACHE.get(n)
+    if ret is None:
+        ret = _NEG_AXES_CACHE[n] = list(range(-n, 0))
+    return ret
+
 
 class Uniform(Distribution):
     """Uniform distribution ``U[low, high)``."""
@@ -27,9 +41,23 @@ class Uniform(Distribution):
 
     log_zero: float
 
+    _is_unit: bool
+    """Whether or not this is the unit uniform distribution ``U[0, 1)``?"""
+
+    _float_bounds: Optional[Tuple[float, float]] = None
+    """The original `low` and `high`, if both are specified as Python floats."""
+
     _neg_log_high_minus_low: Optional[T.Tensor] = None
     """The cached computation result of log(high - low)."""
 
+    _scale: Optional[T.Tensor] = None
+    """The cached computation result of ``high - low``."""
+
+    _COPY_ATTRS = (('shape', '_shape'), 'low', 'high', 'dtype',
+                   'reparameterized', 'event_ndims', 'log_zero',
+                   'device', 'validate_tensors')
+    """The attributes to be copied by :meth:`copy()`."""
+
     def __init__(self,
                  shape: Optional[List[int]] = None,
                  low: Optional[TensorOrData] = None,
@@ -73,12 +101,20 @@ class Uniform(Distribution):
                              'neither specified.')
 
         range_checked = False
+        float_bounds = None
+        host_low_high = None
         if low is not None and high is not None:
             if isinstance(low, float) and isinstance(high, float):
                 if low >= high:
                     raise ValueError(f'`low` < `high` does not hold: '
                                      f'`low` == {low}, `high` == {high}')
                 range_checked = True
+                float_bounds = (low, high)
+            elif isinstance(low, (float, np.ndarray)) and \
+                    isinstance(high, (float, np.ndarray)):
+                # keep the host-side data, such that the range can be
+                # validated without synchronizing with the device
+                host_low_high = (low, high)
 
             low, high = check_tensor_arg_types(
                 ('low', low), ('high', high), default_dtype=dtype,
@@ -103,20 +139,36 @@ class Uniform(Distribution):
 
         if self.validate_tensors and low is not None and high is not None and \
                 not range_checked:
-            if not T.is_all(T.less(low, high)):
+            if host_low_high is not None:
+                range_ok = np.all(np.less(*host_low_high))
+            else:
+                range_ok = T.is_all(T.less(low, high))
+            if not range_ok:
                 raise ValueError('`low` < `high` does not hold.')
 
         self._shape = shape
         self.low = low
         self.high = high
         self.log_zero = log_zero
+        self._is_unit = low is None and high is None
+        self._float_bounds = float_bounds
+
+    def _get_scale(self) -> T.Tensor:
+        if self._scale is None:
+            self._scale = self.high - self.low
+        return self._scale
 
     def _get_neg_log_high_minus_low(self) -> T.Tensor:
         if self._neg_log_high_minus_low is None:
-            if self.low is None or self.high is None:
-                self._neg_log_high_minus_low = T.zeros([], dtype=self.dtype)
+            if self._is_unit:
+                self._neg_log_high_minus_low = T.zeros(
+                    [], dtype=self.dtype, device=self.device)
+            elif self._float_bounds is not None:
+                low, high = self._float_bounds
+                self._neg_log_high_minus_low = T.float_scalar(
+                    -math.log(high - low), dtype=self.dtype, device=self.device)
             else:
-                self._neg_log_high_minus_low = -T.log(self.high - self.low)
+                self._neg_log_high_minus_low = -T.log(self._get_scale())
         return self._neg_log_high_minus_low
 
     def _sample(self,
@@ -126,10 +178,29 @@ class Uniform(Distribution):
                 reparameterized: bool) -> StochasticTensor:
         sample_shape = ([n_samples] + self.value_shape if n_samples is not None
                         else self.value_shape)
-        samples = T.random.rand(sample_shape, dtype=self.dtype, device=self.device)
-        if self.low is not None and self.high is not None:
-            scale = self.high - self.low
-            samples = samples * scale + self.low
+        if self._is_unit:
+            samples = T.random.rand(
+                sample_shape, dtype=self.dtype, device=self.device)
+        elif self._float_bounds is not None:
+            # constant bounds need no gradient, thus the samples can be drawn
+            # and scaled within one kernel
+            low, high = self._float_bounds
+            samples = T.random.uniform(
+                sample_shape, low=low, high=high, dtype=self.dtype,
+                device=self.device,
+            )
+        else:
+            samples = T.random.rand(
+                sample_shape, dtype=self.dtype, device=self.device)
+            if reparameterized:
+                samples = T.addcmul(self.low, samples, self._get_scale())
+            else:
+                # no gradient is required, thus the samples can be
+                # transformed in-place, without allocating another tensor.
+                samples = T.addcmul(
+                    T.stop_grad(self.low), samples,
+                    T.stop_grad(self._get_scale()), out=samples,
+                )
         if not reparameterized:
             samples = T.stop_grad(samples)
 
@@ -145,27 +216,47 @@ class Uniform(Distribution):
                   given: T.Tensor,
                   group_ndims: int,
                   reduce_ndims: int) -> T.Tensor:
-        low = self.low if self.low is not None else 0.
-        high = self.high if self.high is not None else 1.
+        # compare against Python float literals, which are passed to the
+        # kernels directly instead of being allocated as scalar tensors.
+        if self._is_unit:
+            in_range = in_range_mask(given, 0., 1.)
+        elif self._float_bounds is not None:
+            low, high = self._float_bounds
+            in_range = in_range_mask(given, low, high)
+        else:
+            in_range = T.logical_and(self.low <= given, given <= self.high)
+
         log_pdf = self._get_neg_log_high_minus_low()
-        log_pdf = log_pdf_mask(
-            T.logical_and(low <= given, given <= high),
-            log_pdf,
-            self.log_zero,
-        )
+        if reduce_ndims > 0 and T.rank(log_pdf) == 0:
+            # `log_pdf` is a scalar, thus the reduced log-pdf is just
+            # ``n_in * log_pdf + n_out * log_zero``.  Counting the in-range
+            # elements on the boolean mask avoids materializing the log-pdf
+            # at the shape of `given`.
+            n_total = get_tail_size(T.shape(in_range), reduce_ndims)
+            n_in = T.cast_like(
+                T.reduce_sum(in_range, axis=_neg_axes(reduce_ndims)),
+                log_pdf,
+            )
+            return n_in * log_pdf + (n_total - n_in) * self.log_zero
 
-        # broadcast against given if required
-        log_pdf = T.broadcast_to(log_pdf, given)
+        # `in_range` has already been broadcast against `given`, so does
+        # the masked `log_pdf`, thus no further `broadcast_to` is required.
+        log_pdf = log_pdf_mask(in_range, log_pdf, self.log_zero)
         if reduce_ndims > 0:
-            log_pdf = T.reduce_sum(log_pdf, axis=list(range(-reduce_ndims, 0)))
+            log_pdf = T.reduce_sum(log_pdf, axis=_neg_axes(reduce_ndims))
         return log_pdf
 
     def copy(self, **overrided_params):
+        if self._float_bounds is not None and \
+                'low' not in overrided_params and \
+                'high' not in overrided_params:
+            # pass the original float bounds, such that the copied
+            # distribution can also use the fast paths for float bounds
+            low, high = self._float_bounds
+            overrided_params = {'low': low, 'high': high, **overrided_params}
         return copy_distribution(
             cls=Uniform,
             base=self,
-            attrs=(('shape', '_shape'), 'low', 'high', 'dtype',
-                   'reparameterized', 'event_ndims', 'log_zero',
-                   'device', 'validate_tensors'),
+            attrs=Uniform._COPY_ATTRS,
             overrided_params=overrided_params,
         )
@@ -11,6 +11,7 @@ __all__ = [
     'get_prob_reduce_ndims',
     'get_tail_size',
     'log_pdf_mask',
+    'in_range_mask',
     'check_tensor_arg_types',
     'copy_distribution',
 ]
@@ -87,6 +88,15 @@ def log_pdf_mask(condition: Tensor,
     return where(condition, log_pdf, float_scalar_like(log_zero, log_pdf))
 
 
+@jit
+def in_range_mask(given: Tensor, low: float, high: float) -> Tensor:
+    """
+    Get the mask of ``low <= given <= high``, where `low` and `high` are
+    constants, such that the comparisons can be fused by the JIT engine.
+    """
+    return (given >= low) & (given <= high)
+
+
 def check_tensor_arg_types(*args,
                            dtype: Optional[str] = None,
                            device: Optional[str] = None,
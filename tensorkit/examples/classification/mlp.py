@@ -43,7 +43,6 @@ def main(exp: mltk.Experiment[Config]):
         dense(500). \
         dense(500). \
         linear(10). \
-        log_softmax(). \
         build()
     params, param_names = utils.get_params_and_names(net)
     utils.print_parameters_summary(params, param_names)
@@ -46,7 +46,6 @@ def main(exp: mltk.Experiment[Config]):
         res_block2d(64). \
         global_avg_pool2d(). \
         linear(10). \
-        log_softmax(). \
         build()
     params, param_names = utils.get_params_and_names(net)
     utils.print_parameters_summary(params, param_names)
@@ -1,6 +1,6 @@
 from typing import *
 
-from ..tensor import Tensor
+from ..tensor import Tensor, add_n
 from .core import *
 
 __all__ = [
@@ -27,10 +27,14 @@ class AddContext(BaseLayer):
     def forward(self,
                 input: Tensor,
                 context: Optional[List[Tensor]] = None) -> Tensor:
-        if context is not None:
-            for t in context:
-                input = input + t
-        return input
+        if context is None:
+            context = []
+
+        if len(context) == 0:
+            return input
+        if len(context) == 1:
+            return input + context[0]
+        return add_n([input] + context)
 
 
 class MultiplyContext(BaseLayer):
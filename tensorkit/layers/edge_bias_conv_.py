@@ -1,5 +1,5 @@
 from .. import tensor as T
-from ..tensor import Tensor, shape, concat, ones_like
+from ..tensor import Tensor, pad_axis
 from .core import *
 
 __all__ = ['AddOnesChannel1d', 'AddOnesChannel2d', 'AddOnesChannel3d']
@@ -25,11 +25,9 @@ class AddOnesChannelNd(BaseLayer):
         raise NotImplementedError()
 
     def forward(self, input: Tensor) -> Tensor:
-        channel_shape = shape(input)
-        channel_shape[self._channel_axis] = 1
-
-        return concat([input, ones_like(input, shape=channel_shape)],
-                      axis=self._channel_axis)
+        # pad a channel of ones at the end of the channel axis, which
+        # avoids allocating a separated ones tensor and concatenating it.
+        return pad_axis(input, self._channel_axis, (0, 1), 1.)
 
 
 class AddOnesChannel1d(AddOnesChannelNd):
@@ -1,9 +1,12 @@
-from functools import partial
+import copy
+from functools import lru_cache, partial
 from typing import *
 
+import numpy as np
+
 from .. import tensor as T
 from ..arg_check import *
-from ..tensor import Tensor, Module, rank, shift
+from ..tensor import Tensor, Module, rank, shift, split, add_n
 from ..typing_ import *
 from . import resnet, core, composed, edge_bias_conv_
 from .core import *
@@ -16,9 +19,59 @@ __all__ = [
     'PixelCNNConv1d', 'PixelCNNConv2d', 'PixelCNNConv3d',
     'PixelCNNConvTranspose1d', 'PixelCNNConvTranspose2d', 'PixelCNNConvTranspose3d',
     'PixelCNN1d', 'PixelCNN2d', 'PixelCNN3d',
+    'convert_pixelcnn_state_dict',
 ]
 
 
+# the layer classes for each spatial ndims, looked up by the PixelCNN layers
+_ADD_ONES_CHANNEL_CLASSES = {
+    1: edge_bias_conv_.AddOnesChannel1d,
+    2: edge_bias_conv_.AddOnesChannel2d,
+    3: edge_bias_conv_.AddOnesChannel3d,
+}
+_CONV_CLASSES = {1: composed.Conv1d, 2: composed.Conv2d, 3: composed.Conv3d}
+_CONV_TRANSPOSE_CLASSES = {
+    1: composed.ConvTranspose1d,
+    2: composed.ConvTranspose2d,
+    3: composed.ConvTranspose3d,
+}
+_LINEAR_CONV_CLASSES = {
+    1: core.LinearConv1d, 2: core.LinearConv2d, 3: core.LinearConv3d,
+}
+_RES_BLOCK_CLASSES = {
+    1: resnet.ResBlock1d, 2: resnet.ResBlock2d, 3: resnet.ResBlock3d,
+}
+
+_shifted_conv_padding_cache: Dict[Tuple[Tuple[bool, ...], Tuple[int, ...],
+                                         Tuple[int, ...]],
+                                   Tuple[Tuple[int, int], ...]] = {}
+
+
+def get_shifted_conv_padding(spatial_shift: Sequence[bool],
+                             kernel_size: Sequence[int],
+                             dilation: Sequence[int]
+                             ) -> List[Tuple[int, int]]:
+    """
+    Get the padding of a shifted convolution.
+
+    The padding is cached, since every PixelCNN block constructs several
+    convolutions with the same `spatial_shift`, `kernel_size` and `dilation`.
+    """
+    key = (tuple(bool(s) for s in spatial_shift), tuple(kernel_size),
+           tuple(dilation))
+    padding = _shifted_conv_padding_cache.get(key)
+    if padding is None:
+        padding_list = []
+        for shift, k, d in zip(*key):
+            t = (k - 1) * d
+            if shift:
+                padding_list.append((t, 0))
+            else:
+                padding_list.append((t // 2, t - t // 2))
+        padding = _shifted_conv_padding_cache[key] = tuple(padding_list)
+    return list(padding)
+
+
 def shifted_conv(conv_cls,
                  in_channels: int,
                  out_channels: int,
@@ -33,13 +86,7 @@ def shifted_conv(conv_cls,
     kernel_size = validate_conv_size('kernel_size', kernel_size, spatial_ndims)
     dilation = validate_conv_size('dilation', dilation, spatial_ndims)
 
-    padding = []
-    for shift, k, d in zip(spatial_shift, kernel_size, dilation):
-        t = (k - 1) * d
-        if shift:
-            padding.append((t, 0))
-        else:
-            padding.append((t // 2, t - t // 2))
+    padding = get_shifted_conv_padding(spatial_shift, kernel_size, dilation)
 
     return conv_cls(in_channels, out_channels, kernel_size=kernel_size,
                     dilation=dilation, padding=padding, **kwargs)
@@ -59,14 +106,11 @@ def shifted_deconv(deconv_cls,
     kernel_size = validate_conv_size('kernel_size', kernel_size, spatial_ndims)
     dilation = validate_conv_size('dilation', dilation, spatial_ndims)
 
-    padding = []
-    for shift, k, d in zip(spatial_shift, kernel_size, dilation):
-        # a total inverse of the `shifted_conv` method
-        t = (k - 1) * d
-        if shift:
-            padding.append((0, t))
-        else:
-            padding.append((t - t // 2, t // 2))
+    # a total inverse of the `shifted_conv` method
+    padding = [
+        (r, l)
+        for l, r in get_shifted_conv_padding(spatial_shift, kernel_size, dilation)
+    ]
 
     return deconv_cls(in_channels, out_channels, kernel_size=kernel_size,
                       dilation=dilation, padding=padding, **kwargs)
@@ -89,28 +133,12 @@ class SpatialShift(BaseLayer):
         return shift(input, self.shift)
 
 
-class BranchAndAdd(BaseLayer):
-
-    branches: ModuleList
-
-    def __init__(self, *branches: Union[Module, Sequence[Module]]):
-        super().__init__()
-        self.branches = ModuleList(flatten_nested_layers(branches))
-
-    def forward(self, input: Tensor) -> Tensor:
-        branch_outputs: List[Tensor] = []
-        for branch in self.branches:
-            branch_outputs.append(branch(input))
-        output = branch_outputs[0]
-        for branch_output in branch_outputs[1:]:
-            output = output + branch_output
-        return output
-
-
 class AddLeadingContext(BaseLayer):
 
     __constants__ = ('first_n',)
 
+    first_n: int
+
     def __init__(self, first_n: int):
         super().__init__()
         self.first_n = first_n
@@ -145,7 +173,9 @@ class IgnoreLeadingContext(BaseLayer):
         return self.wrapped(input, context[self.first_n:])
 
 
-def get_stack_kernel_sizes(kernel_size: List[int]) -> List[List[int]]:
+@lru_cache(maxsize=None)
+def get_stack_kernel_sizes(kernel_size: Tuple[int, ...]
+                           ) -> Tuple[Tuple[int, ...], ...]:
     spatial_ndims = len(kernel_size)
     ret = []
     for i in range(spatial_ndims):
@@ -156,15 +186,41 @@ def get_stack_kernel_sizes(kernel_size: List[int]) -> List[List[int]]:
             else:
                 k_size = kernel_size[j]
             t.append(k_size)
-        ret.append(t)
-    return ret
+        ret.append(tuple(t))
+    return tuple(ret)
 
 
-def get_stack_conv_shifts(spatial_ndims: int) -> List[List[bool]]:
+@lru_cache(maxsize=None)
+def get_stack_conv_shifts(spatial_ndims: int) -> Tuple[Tuple[bool, ...], ...]:
     ret = []
     for i in range(spatial_ndims):
-        ret.append([True] * (i + 1) + [False] * (spatial_ndims - i - 1))
-    return ret
+        ret.append((True,) * (i + 1) + (False,) * (spatial_ndims - i - 1))
+    return tuple(ret)
+
+
+def split_initializer(initializer: TensorInitArgType,
+                      n_parts: int) -> TensorInitArgType:
+    """
+    Get the initializer for a parameter, which is the concatenation of
+    `n_parts` equal-sized parameters along the first axis.
+
+    Each part will be initialized as if it were a separated parameter of
+    `initializer`, e.g., the fan-in and fan-out are calculated for each part.
+    """
+    if n_parts == 1:
+        return initializer
+    if callable(initializer):
+        def f(tensor: Tensor, **kwargs):
+            kwargs.pop('fan_in_and_fan_out', None)
+            part_size = T.shape(tensor)[0] // n_parts
+            for part in split(tensor, [part_size] * n_parts, axis=0):
+                initializer(part, **kwargs)
+        return f
+    if isinstance(initializer, Tensor):
+        initializer = T.to_numpy(initializer)
+    if isinstance(initializer, np.ndarray) and initializer.shape != ():
+        return np.concatenate([initializer] * n_parts, axis=0)
+    return initializer
 
 
 def validate_pixelcnn_kernel_size(kernel_size, spatial_ndims: int) -> List[int]:
@@ -186,13 +242,54 @@ def validate_pixelcnn_kernel_size(kernel_size, spatial_ndims: int) -> List[int]:
 
 
 # ---- pixelcnn input layer, which constructs the multiple pixelcnn stacks ----
+def _convert_old_input_layer_params(state_dict: Dict[str, Any],
+                                    prefix: str,
+                                    old_branch_prefixes: List[List[str]]
+                                    ) -> None:
+    # The j-th branch of the i-th stack used to be stored under
+    # ``stacks.{i}.branches.{j}.0.`` (or ``stacks.0.0.`` for ``i == 0``).
+    # `old_branch_prefixes[k]` lists such prefixes for the k-th merged branch.
+    old_prefix = prefix + 'stacks.'
+    if not any(key.startswith(old_prefix) for key in state_dict):
+        return
+
+    for k, src_prefixes in enumerate(old_branch_prefixes):
+        src_prefixes = [prefix + p for p in src_prefixes]
+        dst_prefix = f'{prefix}branches.{k}.0.'
+        for key in list(state_dict):
+            if key.startswith(src_prefixes[0]):
+                suffix = key[len(src_prefixes[0]):]
+                src_keys = [p + suffix for p in src_prefixes]
+                if all(src_key in state_dict for src_key in src_keys):
+                    values = [state_dict.pop(src_key) for src_key in src_keys]
+                    if len(values) == 1:
+                        state_dict[dst_prefix + suffix] = values[0]
+                    else:
+                        # the parameters of the merged convolution have the
+                        # output channel as the first axis
+                        state_dict[dst_prefix + suffix] = \
+                            T.concat(values, axis=0)
+
+
 class PixelCNNInputNd(BaseLayer):
 
-    __constants__ = ('_spatial_ndims',)
+    __constants__ = ('_spatial_ndims', 'out_channels', '_channel_axis',
+                     '_branch_first_stacks', '_branch_stack_counts')
 
     _spatial_ndims: int
+    out_channels: int
+    _channel_axis: int
     add_ones_channel: Module
-    stacks: ModuleList
+    branches: ModuleList
+    _branch_first_stacks: List[int]
+    """The index of the first stack covered by each of the `branches`."""
+    _branch_stack_counts: List[int]
+    """The number of stacks covered by each of the `branches`."""
+    _old_branch_prefixes: List[List[str]]
+    """
+    The parameter name prefixes, in the layout before the branches of the
+    stacks were merged, of the stacks covered by each of the `branches`.
+    """
 
     def __init__(self,
                  in_channels: int,
@@ -231,56 +328,82 @@ class PixelCNNInputNd(BaseLayer):
             data_init: The data-dependent initializer for the convolutional layers.
             device: The device where to place new tensors and variables.
         """
-        super().__init__()
-
         spatial_ndims = self._get_spatial_ndims()
         kernel_size = validate_conv_size('kernel_size', kernel_size, spatial_ndims)
-        
+
         # construct the layer
         super().__init__()
         self._spatial_ndims = spatial_ndims
-        
+
         if edge_bias:
-            self.add_ones_channel = getattr(
-                edge_bias_conv_, f'AddOnesChannel{spatial_ndims}d')()
+            self.add_ones_channel = \
+                _ADD_ONES_CHANNEL_CLASSES[spatial_ndims]()
             in_channels += 1
         else:
             self.add_ones_channel = Identity()
 
-        stack_kernel_sizes = get_stack_kernel_sizes(kernel_size)
+        stack_kernel_sizes = get_stack_kernel_sizes(tuple(kernel_size))
         stack_conv_shifts = get_stack_conv_shifts(spatial_ndims)
 
-        stacks = []
-        for i in range(1, spatial_ndims + 1):
-            stack_branches = []
-            for j in range(i):
-                spatial_shift = [0] * spatial_ndims
-                spatial_shift[j] = 1
+        # The i-th stack is the sum of the branches `0 ... i`, where the
+        # j-th branch has the same architecture in every stack.  Without
+        # weight norm, the j-th branches of all the stacks
+        # `j ... spatial_ndims - 1` are merged into one wider convolution,
+        # whose output is split along the channel axis afterwards.  This is
+        # equivalent to having separated convolutions, since the weight and
+        # bias of each stack are initialized separately (see
+        # `split_initializer`), and the data-dependent initializers work on
+        # each output channel.  The weight norm, however, normalizes the
+        # weight of a convolution across all its output channels, thus the
+        # branches are not merged if weight norm is used.
+        merged_branches = \
+            weight_norm is False or weight_norm == WeightNormMode.NONE
+        branches = []
+        branch_first_stacks = []
+        branch_stack_counts = []
+        old_branch_prefixes = []
+        for j in range(spatial_ndims):
+            spatial_shift = [0] * spatial_ndims
+            spatial_shift[j] = 1
 
+            if merged_branches:
+                stack_groups = [(j, spatial_ndims - j)]
+            else:
+                stack_groups = [(i, 1) for i in range(j, spatial_ndims)]
+
+            for first_stack, stack_count in stack_groups:
                 # architecture similar to PixelCNN++, but the kernel_size varies.
-                stack_branches.append(
+                branches.append(
                     Sequential(
                         shifted_conv(
-                            getattr(composed, f'Conv{spatial_ndims}d'),
+                            _CONV_CLASSES[spatial_ndims],
                             in_channels=in_channels,
-                            out_channels=out_channels,
+                            out_channels=out_channels * stack_count,
                             spatial_shift=stack_conv_shifts[j],
                             kernel_size=stack_kernel_sizes[j],
                             weight_norm=weight_norm,
-                            weight_init=weight_init,
-                            bias_init=bias_init,
+                            weight_init=split_initializer(
+                                weight_init, stack_count),
+                            bias_init=split_initializer(bias_init, stack_count),
                             data_init=data_init,
                             device=device,
                         ),
                         SpatialShift(spatial_shift)
                     )
                 )
-
-            if len(stack_branches) == 1:
-                stacks.append(stack_branches[0])
-            else:
-                stacks.append(BranchAndAdd(stack_branches))
-        self.stacks = ModuleList(stacks)
+                branch_first_stacks.append(first_stack)
+                branch_stack_counts.append(stack_count)
+                old_branch_prefixes.append([
+                    'stacks.0.0.' if i == 0 else f'stacks.{i}.branches.{j}.0.'
+                    for i in range(first_stack, first_stack + stack_count)
+                ])
+
+        self.branches = ModuleList(branches)
+        self.out_channels = out_channels
+        self._channel_axis = -1 if T.IS_CHANNEL_LAST else -(spatial_ndims + 1)
+        self._branch_first_stacks = branch_first_stacks
+        self._branch_stack_counts = branch_stack_counts
+        self._old_branch_prefixes = old_branch_prefixes
 
     def _get_spatial_ndims(self) -> int:
         raise NotImplementedError()
@@ -293,11 +416,43 @@ class PixelCNNInputNd(BaseLayer):
             )
 
         output = self.add_ones_channel(input)
+
+        # gather the branch outputs of each stack, in the order of branches
+        stack_inputs: List[List[Tensor]] = []
+        for i in range(self._spatial_ndims):
+            this_stack_inputs: List[Tensor] = []
+            stack_inputs.append(this_stack_inputs)
+
+        k = 0
+        for branch in self.branches:
+            first_stack = self._branch_first_stacks[k]
+            branch_outputs = split(
+                branch(output),
+                [self.out_channels] * self._branch_stack_counts[k],
+                axis=self._channel_axis,
+            )
+            for i in range(len(branch_outputs)):
+                stack_inputs[first_stack + i].append(branch_outputs[i])
+            k += 1
+
+        # the i-th stack is the sum of the branch outputs `0 ... i`
         outputs: List[Tensor] = []
-        for stack in self.stacks:
-            outputs.append(stack(output))
+        for i in range(self._spatial_ndims):
+            outputs.append(add_n(stack_inputs[i]))
         return outputs
 
+    def _load_from_state_dict(self, state_dict, prefix, local_metadata, strict,
+                              missing_keys, unexpected_keys, error_msgs):
+        # convert the parameters saved before the branches of the stacks were
+        # merged.  This method is lost by `jit_compile`, where the parameters
+        # should be converted by `convert_pixelcnn_state_dict()` instead.
+        _convert_old_input_layer_params(
+            state_dict, prefix, self._old_branch_prefixes)
+
+        super()._load_from_state_dict(
+            state_dict, prefix, local_metadata, strict, missing_keys,
+            unexpected_keys, error_msgs)
+
 
 class PixelCNNInput1d(PixelCNNInputNd):
     """
@@ -464,7 +619,7 @@ class PixelCNNResBlockNd(BaseLayer):
 
         # construct the pixelcnn layer stacks
         resnet_layers = []
-        stack_kernel_sizes = get_stack_kernel_sizes(kernel_size)
+        stack_kernel_sizes = get_stack_kernel_sizes(tuple(kernel_size))
         stack_conv_shifts = get_stack_conv_shifts(spatial_ndims)
 
         for i in range(spatial_ndims):
@@ -484,11 +639,11 @@ class PixelCNNResBlockNd(BaseLayer):
 
             conv_factory = partial(
                 shifted_conv,
-                getattr(core, f'LinearConv{spatial_ndims}d'),
+                _LINEAR_CONV_CLASSES[spatial_ndims],
                 spatial_shift=stack_conv_shifts[i],
             )
             resnet_layers.append(
-                getattr(resnet, f'ResBlock{spatial_ndims}d')(
+                _RES_BLOCK_CLASSES[spatial_ndims](
                     in_channels=in_channels,
                     out_channels=out_channels,
                     kernel_size=stack_kernel_sizes[i],
@@ -521,14 +676,15 @@ class PixelCNNResBlockNd(BaseLayer):
         if context is None:
             context = []
 
+        # `merged_context` is always `resnet_outputs + context`, maintained
+        # in place instead of being re-built for every stack.
+        merged_context: List[Tensor] = list(context)
         resnet_outputs: List[Tensor] = []
         i = 0
         for resnet_layer in self.resnet_layers:
-            this_output = resnet_layer(
-                inputs[i],
-                resnet_outputs + context,
-            )
+            this_output = resnet_layer(inputs[i], merged_context)
             resnet_outputs.append(this_output)
+            merged_context.insert(i, this_output)
             i += 1
 
         return resnet_outputs
@@ -591,13 +747,13 @@ class PixelCNNConvNd(BaseLayer):
 
         # construct the conv layer stacks
         conv_layers = []
-        stack_kernel_sizes = get_stack_kernel_sizes(kernel_size)
+        stack_kernel_sizes = get_stack_kernel_sizes(tuple(kernel_size))
         stack_conv_shifts = get_stack_conv_shifts(spatial_ndims)
 
         for i in range(spatial_ndims):
             conv_factory = partial(
                 shifted_conv,
-                getattr(composed, f'Conv{spatial_ndims}d'),
+                _CONV_CLASSES[spatial_ndims],
                 spatial_shift=stack_conv_shifts[i],
             )
             conv_layers.append(
@@ -714,13 +870,13 @@ class PixelCNNConvTransposeNd(BaseLayer):
 
         # construct the conv layer stacks
         deconv_layers = []
-        stack_kernel_sizes = get_stack_kernel_sizes(kernel_size)
+        stack_kernel_sizes = get_stack_kernel_sizes(tuple(kernel_size))
         stack_conv_shifts = get_stack_conv_shifts(spatial_ndims)
 
         for i in range(spatial_ndims):
             deconv_factory = partial(
                 shifted_deconv,
-                getattr(composed, f'ConvTranspose{spatial_ndims}d'),
+                _CONV_TRANSPOSE_CLASSES[spatial_ndims],
                 spatial_shift=stack_conv_shifts[i],
             )
             deconv_layers.append(
@@ -802,6 +958,14 @@ class PixelCNNConvTranspose3d(PixelCNNConvTransposeNd):
 
 
 # ---- pixelcnn network composer ----
+_INPUT_LAYER_CLASSES = {
+    1: PixelCNNInput1d, 2: PixelCNNInput2d, 3: PixelCNNInput3d,
+}
+_OUTPUT_LAYER_CLASSES = {
+    1: PixelCNNOutput1d, 2: PixelCNNOutput2d, 3: PixelCNNOutput3d,
+}
+
+
 class PixelCNNNd(BaseLayer):
 
     input_layer: Module
@@ -819,18 +983,17 @@ class PixelCNNNd(BaseLayer):
             *layers: The convolution layers.
         """
         spatial_ndims = self._get_spatial_ndims()
-        global_dict = globals()
 
-        input_cls_name = f'PixelCNNInput{spatial_ndims}d'
-        if not isinstance(input_layer, global_dict[input_cls_name]) and \
+        input_layer_cls = _INPUT_LAYER_CLASSES[spatial_ndims]
+        if not isinstance(input_layer, input_layer_cls) and \
                 not is_jit_layer(input_layer):
             raise TypeError(
-                f'`input_layer` must be an instance of `{input_cls_name}`: '
-                f'got {input_layer!r}.'
+                f'`input_layer` must be an instance of '
+                f'`{input_layer_cls.__qualname__}`: got {input_layer!r}.'
             )
         layers = flatten_nested_layers(layers)
 
-        output_layer_cls = global_dict[f'PixelCNNOutput{spatial_ndims}d']
+        output_layer_cls = _OUTPUT_LAYER_CLASSES[spatial_ndims]
 
         super().__init__()
         self.input_layer = input_layer
@@ -889,3 +1052,35 @@ class PixelCNN3d(PixelCNNNd):
 
     def _get_spatial_ndims(self) -> int:
         return 3
+
+
+def convert_pixelcnn_state_dict(module: Module,
+                                state_dict: Mapping[str, Any]
+                                ) -> Dict[str, Any]:
+    """
+    Convert a state dict saved before the branches of the stacks in the
+    PixelCNN input layers were merged, such that it can be loaded by `module`.
+
+    The input layers convert such state dicts by themselves, but not after
+    being compiled by :func:`jit_compile`.  This function works for both the
+    compiled and the non-compiled modules, for example::
+
+        net = tk.layers.jit_compile(tk.layers.PixelCNN2d(...))
+        net.load_state_dict(
+            tk.layers.convert_pixelcnn_state_dict(net, old_state_dict))
+
+    Args:
+        module: The module to load the state dict, which contains the
+            PixelCNN input layers (or is itself a PixelCNN input layer).
+        state_dict: The state dict to be converted.  It will not be modified.
+
+    Returns:
+        The converted state dict.
+    """
+    state_dict = copy.copy(state_dict)
+    for name, layer in module.named_modules():
+        old_branch_prefixes = getattr(layer, '_old_branch_prefixes', None)
+        if old_branch_prefixes is not None:
+            _convert_old_input_layer_params(
+                state_dict, f'{name}.' if name else '', old_branch_prefixes)
+    return state_dict
@@ -258,7 +258,7 @@ def discretized_logistic(mean: Tensor,
     if validate_tensors:
         scale = assert_finite(scale, 'scale')
 
-    sample = mean + scale * inverse_logistic_cdf
+    sample = addcmul(mean, scale, inverse_logistic_cdf)
     if discretize:
         sample = _discretized_logistic_discretize(
             sample, bin_size, min_val, max_val)
@@ -1,7 +1,6 @@
 from typing import *
 
 import mltk
-import numpy as np
 from mltk import ArrayTuple
 
 from .. import tensor as T
@@ -50,7 +49,7 @@ class TensorStream(mltk.DataStream):
             for batch_data in g:
                 with T.no_grad():
                     batch_data = tuple(
-                        T.as_tensor(np.copy(arr), device=self.device)
+                        T.from_numpy(arr, device=self.device)
                         for arr in batch_data
                     )
                 yield batch_data
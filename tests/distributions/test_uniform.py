@@ -30,6 +30,7 @@ class UniformTestCase(TestCase):
             self.assertEqual(uniform.low, -1.)
             self.assertEqual(uniform.high, 2.)
             self.assertEqual(uniform.event_ndims, 0)
+            self.assertEqual(uniform._float_bounds, (-1., 2.))
 
             # specify `low`, `high` tensors
             low_t = T.full([2, 1], -1., dtype=dtype)
@@ -41,6 +42,7 @@ class UniformTestCase(TestCase):
             self.assertEqual(uniform.event_ndims, 2)
             self.assertIs(uniform.low, low_t)
             self.assertIs(uniform.high, high_t)
+            self.assertIsNone(uniform._float_bounds)
 
             # specify `low` or `high`, one as tensor and one as numpy array
             for low, high in [(low_t, T.to_numpy(high_t)),
@@ -124,6 +126,13 @@ class UniformTestCase(TestCase):
                         high=T.full([2, 3], -1., dtype=T.float32),
                         validate_tensors=True)
 
+        # numpy bounds are validated on the host
+        with pytest.raises(Exception, match='`low` < `high` does not hold'):
+            _ = Uniform(low=np.full([2, 3], 2.), high=np.full([2, 3], -1.),
+                        validate_tensors=True)
+        _ = Uniform(low=np.full([2, 3], 2.), high=np.full([2, 3], -1.),
+                    validate_tensors=False)
+
     def test_copy(self):
         for dtype in float_dtypes:
             low_t = T.full([2, 1], -1., dtype=dtype)
@@ -139,6 +148,12 @@ class UniformTestCase(TestCase):
             self.assertEqual(uniform.event_ndims, 1)
             self.assertEqual(uniform.log_zero, -1e6)
 
+            # the cached `high - low` should be re-used, but not copied
+            scale = uniform._get_scale()
+            assert_allclose(scale, high_t - low_t)
+            self.assertIs(uniform._get_scale(), scale)
+            self.assertIsNone(uniform.copy()._scale)
+
             with mock.patch('tensorkit.distributions.uniform.copy_distribution',
                             wraps=copy_distribution) as f_copy:
                 uniform2 = uniform.copy(event_ndims=2)
@@ -157,6 +172,20 @@ class UniformTestCase(TestCase):
                               'device', 'validate_tensors'),
                     'overrided_params': {'event_ndims': 2},
                 }))
+            self.assertIsNone(uniform2._float_bounds)
+
+            # the float bounds should be carried across
+            uniform = Uniform(shape=[5, 4], low=-1., high=2., dtype=dtype)
+            uniform2 = uniform.copy(event_ndims=1)
+            self.assertEqual(uniform2._float_bounds, (-1., 2.))
+            self.assertEqual(uniform2.dtype, dtype)
+            self.assertEqual(uniform2.value_shape, [5, 4])
+            self.assertEqual(uniform2.event_ndims, 1)
+            assert_equal(uniform2.low, uniform.low)
+            assert_equal(uniform2.high, uniform.high)
+            uniform2 = uniform.copy(low=low_t, high=high_t)
+            self.assertIsNone(uniform2._float_bounds)
+            self.assertIs(uniform2.low, low_t)
 
     def test_sample_and_log_prob(self):
         array_low = np.random.randn(2, 1)
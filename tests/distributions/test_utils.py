@@ -118,6 +118,15 @@ class DistributionUtilsTestCase(TestCase):
             expected = np.where(x >= 0., x ** 2, T.random.LOG_ZERO_VALUE)
             assert_allclose(ret, expected, rtol=1e-4)
 
+    def test_in_range_mask(self):
+        x = np.random.randn(3, 4, 5)
+
+        for dtype in float_dtypes:
+            x_t = T.as_tensor(x, dtype=dtype)
+            ret = in_range_mask(x_t, -0.5, 1.)
+            self.assertEqual(T.get_dtype(ret), T.boolean)
+            assert_equal(ret, np.logical_and(x >= -0.5, x <= 1.))
+
     def test_check_tensor_arg_types(self):
         for dtype in float_dtypes:
             # check ordinary usage: mixed floats, numbers, mutual groups
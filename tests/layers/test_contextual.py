@@ -21,7 +21,12 @@ class ContextualTestCase(TestCase):
                    T.random.randn([2, 3, 4])]
         layer = tk.layers.jit_compile(tk.layers.AddContext())
         assert_equal(layer(x), x)
+        assert_equal(layer(x, []), x)
+        assert_equal(layer(x, context[:1]), x + context[0])
         assert_equal(layer(x, context), x + context[0] + context[1])
+        # contexts that need to broadcast
+        context2 = [T.random.randn([3, 4]), T.random.randn([2, 1, 4])]
+        assert_equal(layer(x, context2), x + context2[0] + context2[1])
 
     def test_MultiplyContext(self):
         x = T.random.randn([2, 3, 4])
@@ -7,6 +7,9 @@ import pytest
 
 import tensorkit as tk
 from tensorkit import tensor as T
+from tensorkit.layers.pixelcnn import (get_stack_kernel_sizes,
+                                       get_stack_conv_shifts, shifted_conv,
+                                       split_initializer)
 from tensorkit.tensor import Tensor
 from tests.helper import *
 from tests.ops import *
@@ -241,6 +244,125 @@ class PixelCNNTestCase(TestCase):
                     make_causal_mask(size, [0] * spatial_ndims).astype(np.int32)
                 )
 
+    def test_split_initializer(self):
+        # callable initializer, which should be applied on each part
+        part_shapes = []
+
+        def initializer(t, **kwargs):
+            self.assertNotIn('fan_in_and_fan_out', kwargs)
+            part_shapes.append(T.shape(t))
+            T.fill(t, len(part_shapes))
+
+        self.assertIs(split_initializer(initializer, 1), initializer)
+        t = T.zeros([6, 2, 3])
+        split_initializer(initializer, 3)(t, fan_in_and_fan_out=(6, 36))
+        self.assertEqual(part_shapes, [[2, 2, 3]] * 3)
+        assert_equal(
+            t, np.reshape(np.repeat([1., 2., 3.], 12), [6, 2, 3]))
+
+        # array and tensor initializers, which should be repeated
+        x = np.random.randn(2, 3)
+        assert_equal(split_initializer(x, 3), np.concatenate([x] * 3, axis=0))
+        assert_equal(split_initializer(T.as_tensor(x), 3),
+                     np.concatenate([x] * 3, axis=0))
+
+        # scalar initializers, which should be kept unchanged
+        self.assertEqual(split_initializer(1.5, 3), 1.5)
+        self.assertIsNone(split_initializer(None, 3))
+
+    def test_input_layer_branches(self):
+        in_channels = 3
+        out_channels = 4
+
+        for size in [[9], [9, 8], [9, 8, 7]]:
+            spatial_ndims = len(size)
+            kernel_size = [5, 3, 5][:spatial_ndims]
+            stack_kernel_sizes = get_stack_kernel_sizes(tuple(kernel_size))
+            stack_conv_shifts = get_stack_conv_shifts(spatial_ndims)
+            conv_cls = getattr(tk.layers, f'Conv{spatial_ndims}d')
+            input_layer_cls = getattr(
+                tk.layers, f'PixelCNNInput{spatial_ndims}d')
+
+            for weight_norm in [False, True]:
+                # the separated convolution for the j-th branch of the i-th
+                # stack, as well as the parameters in the original layout
+                convs = {}
+                old_state_dict = {}
+                for i in range(spatial_ndims):
+                    for j in range(i + 1):
+                        conv = shifted_conv(
+                            conv_cls,
+                            in_channels=in_channels + 1,
+                            out_channels=out_channels,
+                            spatial_shift=stack_conv_shifts[j],
+                            kernel_size=stack_kernel_sizes[j],
+                            weight_norm=weight_norm,
+                            bias_init=tk.init.normal,
+                        )
+                        convs[i, j] = conv
+                        if i == 0:
+                            old_prefix = 'stacks.0.0.'
+                        else:
+                            old_prefix = f'stacks.{i}.branches.{j}.0.'
+                        for key, value in conv.state_dict().items():
+                            old_state_dict[old_prefix + key] = value
+
+                input_layer = input_layer_cls(
+                    in_channels, out_channels, kernel_size=kernel_size,
+                    weight_norm=weight_norm,
+                )
+                input_layer.load_state_dict(old_state_dict)
+
+                # compute the expected outputs by the separated convolutions
+                x = T.random.randn(make_conv_shape([2], in_channels, size))
+                x_ones = T.concat(
+                    [x, T.ones(make_conv_shape([2], 1, size))],
+                    axis=get_channel_axis(spatial_ndims),
+                )
+                expected_outputs = []
+                for i in range(spatial_ndims):
+                    expected = 0.
+                    for j in range(i + 1):
+                        spatial_shift = [0] * spatial_ndims
+                        spatial_shift[j] = 1
+                        if T.IS_CHANNEL_LAST:
+                            spatial_shift.append(0)
+                        expected = expected + \
+                            T.shift(convs[i, j](x_ones), spatial_shift)
+                    expected_outputs.append(expected)
+
+                outputs = input_layer(x)
+                self.assertEqual(len(outputs), spatial_ndims)
+                for output, expected in zip(outputs, expected_outputs):
+                    assert_allclose(output, expected, atol=1e-5, rtol=1e-5)
+
+                outputs = tk.layers.jit_compile(input_layer)(x)
+                for output, expected in zip(outputs, expected_outputs):
+                    assert_allclose(output, expected, atol=1e-5, rtol=1e-5)
+
+                # load the parameters into a compiled network
+                network = tk.layers.jit_compile(
+                    getattr(tk.layers, f'PixelCNN{spatial_ndims}d')(
+                        input_layer_cls(
+                            in_channels, out_channels, kernel_size=kernel_size,
+                            weight_norm=weight_norm,
+                        )
+                    )
+                )
+                network_state_dict = {
+                    f'input_layer.{key}': value
+                    for key, value in old_state_dict.items()
+                }
+                old_keys = sorted(network_state_dict)
+                converted = tk.layers.convert_pixelcnn_state_dict(
+                    network, network_state_dict)
+                self.assertEqual(sorted(network_state_dict), old_keys)
+                self.assertEqual(
+                    sorted(converted), sorted(network.state_dict()))
+                network.load_state_dict(converted)
+                assert_allclose(network(x), expected_outputs[-1],
+                                atol=1e-5, rtol=1e-5)
+
     def test_pixelcnn_network(self):
         in_channels = 3
         out_channels = 5
@@ -1350,6 +1350,10 @@ class TensorCoreTestCase(TestCase):
         assert_allclose(T.pow(T.as_tensor(np.abs(x)), t2),
                         np.abs(x) ** y)
         assert_allclose(T.sqrt(T.as_tensor(np.abs(x))), np.sqrt(np.abs(x)))
+        assert_allclose(T.addcmul(t2, t1, t2), y + x * y)
+        out = T.zeros_like(t1)
+        self.assertIs(T.addcmul(t2, t1, t2, out=out), out)
+        assert_allclose(out, y + x * y)
 
         # for division, of course y should not equal to zero
         y = np.asarray(y == 0, dtype=y.dtype) + y